@@ -6,29 +6,56 @@ Features:
 - Built-ins: cd, pwd, exit, echo, clear, ls, cat, mkdir, rmdir, rm, touch, kill
 - Foreground and background execution of external commands
 - Job control: jobs, fg <jobid>, bg <jobid>
-- Tracks process status; handles SIGCHLD to update job table
-- Uses subprocess.Popen with new process groups so signals can be delivered to whole job
+- Tracks process status; a reaper thread waits on children to update job table
+- Spawns external commands with posix_spawnp (fork+execvp fallback) in new process groups so signals can be delivered to whole job
 Notes:
 - Unix-only (uses os.setpgrp, signals, waitpid, ...). Tested on Linux/macOS.
 """
 
 import os
 import sys
+import errno
+import shutil
 import shlex
 import signal
-import subprocess
 import time
-from collections import OrderedDict
+import heapq
+import threading
 import getpass
+import atexit
+import functools
+
+try:
+    # GNU readline gives input() line editing and history
+    import readline
+except ImportError:
+    readline = None
 
 # Config
 DONE_ENTRY_TTL = 60.0  # seconds to keep Done/Exited job entries before pruning
-
-# Global job table: job_id -> {pid, proc (Popen), cmdline, status, start_time, exitcode}
+PRUNE_INTERVAL = 5.0  # minimum seconds between prune passes in the REPL
+HISTORY_FILE = os.path.expanduser("~/.myshell_history")
+HISTORY_LENGTH = 1000  # lines kept in HISTORY_FILE
+
+class Job:
+    """One entry in the job table."""
+    __slots__ = ("pid", "cmdline", "status", "start_time", "exitcode")
+
+    def __init__(self, pid, cmdline, status, start_time, exitcode=None):
+        self.pid = pid
+        self.cmdline = cmdline
+        self.status = status
+        self.start_time = start_time
+        self.exitcode = exitcode
+
+# Global job table: job_id -> Job
 # status values: "Running", "Stopped", "Exited(<code>)", "Signaled(<sig>)", "Done"
-jobs = OrderedDict()
+jobs = {}
 next_job_id = 1
 
+# Min-heap of (expiry_time, job_id) for finished jobs awaiting pruning
+_expiry_heap = []
+
 # Map pid -> job_id for quick lookup
 pid_to_jid = {}
 
@@ -42,18 +69,12 @@ def _get_next_job_id():
     next_job_id += 1
     return jid
 
-def add_job(proc: subprocess.Popen, cmdline: str, status="Running"):
+def add_job(pid: int, cmdline: str, status="Running"):
     """Add a background job to the table and return its job id."""
-    jid = _get_next_job_id()
-    jobs[jid] = {
-        "pid": proc.pid,
-        "proc": proc,
-        "cmdline": cmdline,
-        "status": status,
-        "start_time": time.time(),
-        "exitcode": None,
-    }
-    pid_to_jid[proc.pid] = jid
+    with _job_lock:
+        jid = _get_next_job_id()
+        jobs[jid] = Job(pid, cmdline, status, time.time())
+        pid_to_jid[pid] = jid
     return jid
 
 def remove_job_by_pid(pid):
@@ -61,66 +82,98 @@ def remove_job_by_pid(pid):
     if jid is not None:
         jobs.pop(jid, None)
 
-def update_job_status(pid, status, exitcode=None):
-    jid = pid_to_jid.get(pid)
-    if jid is not None and jid in jobs:
-        jobs[jid]["status"] = status
-        if exitcode is not None:
-            jobs[jid]["exitcode"] = exitcode
-
-def mark_job_done(pid, exitcode=None):
-    """Mark job done/Exited/Signaled as appropriate but keep entry for TTL."""
-    jid = pid_to_jid.get(pid)
-    if jid is not None and jid in jobs:
-        if exitcode is not None:
-            jobs[jid]["status"] = f"Exited({exitcode})"
-            jobs[jid]["exitcode"] = exitcode
-        else:
-            # If caller didn't supply exitcode, leave to other handlers
-            jobs[jid]["status"] = "Done"
-        # remove pid->jid mapping so operations like fg/bg won't find it as running
-        pid_to_jid.pop(pid, None)
+def schedule_job_expiry(jid):
+    """Queue a finished job for removal once DONE_ENTRY_TTL has passed."""
+    heapq.heappush(_expiry_heap, (time.time() + DONE_ENTRY_TTL, jid))
+
+def update_job_status(pid, status):
+    job = jobs.get(pid_to_jid.get(pid))
+    if job is not None:
+        job.status = status
+
+def mark_job_done(pid, status, exitcode=None):
+    """Record a job's terminal status but keep entry for TTL."""
+    # remove pid->jid mapping so operations like fg/bg won't find it as running
+    jid = pid_to_jid.pop(pid, None)
+    job = jobs.get(jid) if jid is not None else None
+    if job is not None:
+        job.status = status
+        job.exitcode = exitcode
+        schedule_job_expiry(jid)
 
 def find_job_by_jid(jid):
     return jobs.get(jid)
 
-# ---- Signal handlers ----
-def sigchld_handler(signum, frame):
+# ---- Child reaping ----
+# A single reaper thread owns waitpid(). Everything it touches (job table,
+# pid_to_jid, _expiry_heap, _live_pids, _fg_waits) is guarded by _job_lock.
+_job_lock = threading.Condition()
+
+# pids we spawned that haven't exited yet; the reaper sleeps while empty
+_live_pids = set()
+
+# pid -> wait status (None until stopped/exited) for foreground waiters
+_fg_waits = {}
+
+def _handle_wait(pid, status):
+    """Apply one waitpid() result. Caller holds _job_lock."""
+    if os.WIFEXITED(status):
+        exitcode = os.WEXITSTATUS(status)
+        mark_job_done(pid, f"Exited({exitcode})", exitcode)
+        _live_pids.discard(pid)
+    elif os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        mark_job_done(pid, f"Signaled({sig})")
+        _live_pids.discard(pid)
+    elif os.WIFSTOPPED(status):
+        update_job_status(pid, "Stopped")
+    elif os.WIFCONTINUED(status):
+        update_job_status(pid, "Running")
+        return
+    if pid in _fg_waits:
+        _fg_waits[pid] = status
+        _job_lock.notify_all()
+
+def _reaper():
+    """Reaper thread: block in waitpid(-1) and update job table."""
+    # Ctrl-C/Ctrl-Z must reach the main thread, which runs the forwarding handlers
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTSTP})
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WUNTRACED | os.WCONTINUED)
+        except ChildProcessError:
+            # no children; sleep until _spawn starts one
+            with _job_lock:
+                while not _live_pids:
+                    _job_lock.wait()
+            continue
+        with _job_lock:
+            try:
+                _handle_wait(pid, status)
+            except Exception:
+                # keep the reaper alive; a bad status shouldn't stop reaping
+                pass
+
+def _wait_foreground(pid):
     """
-    Reap children and update job table.
-    Uses os.waitpid in a loop with WNOHANG|WUNTRACED|WCONTINUED.
+    Block until the reaper reports pid stopped or finished; return its wait status.
+    pid must have been registered in _fg_waits under _job_lock beforehand.
+    Raises ChildProcessError if pid isn't a live child, as waitpid() would.
     """
-    try:
-        while True:
-            # -1: any child. Flags: WNOHANG so we don't block; get stopped/continued children too.
-            pid, status = os.waitpid(-1, os.WNOHANG | os.WUNTRACED | os.WCONTINUED)
-            if pid == 0:
-                break
-            if pid < 0:
-                break
-            # Interpret status
-            if os.WIFEXITED(status):
-                exitcode = os.WEXITSTATUS(status)
-                update_job_status(pid, f"Exited({exitcode})", exitcode=exitcode)
-                mark_job_done(pid, exitcode=exitcode)
-            elif os.WIFSIGNALED(status):
-                sig = os.WTERMSIG(status)
-                update_job_status(pid, f"Signaled({sig})")
-                mark_job_done(pid, exitcode=None)
-            elif os.WIFSTOPPED(status):
-                sig = os.WSTOPSIG(status)
-                update_job_status(pid, "Stopped")
-            elif os.WIFCONTINUED(status):
-                update_job_status(pid, "Running")
-    except ChildProcessError:
-        # no child processes
-        pass
-    except Exception:
-        # keep handler robust; avoid printing from signal handler
-        pass
+    with _job_lock:
+        if pid not in _live_pids and _fg_waits.get(pid) is None:
+            # already reaped; the reaper will never report it again
+            _fg_waits.pop(pid, None)
+            raise ChildProcessError(f"no live child with pid {pid}")
+        while _fg_waits[pid] is None:
+            _job_lock.wait()
+        return _fg_waits.pop(pid)
+
+# we reap explicitly, so SIGCHLD keeps its default disposition
+signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+threading.Thread(target=_reaper, name="reaper", daemon=True).start()
 
 # ignore signals that would interfere with terminal control
-signal.signal(signal.SIGCHLD, sigchld_handler)
 signal.signal(signal.SIGTTOU, signal.SIG_IGN)
 signal.signal(signal.SIGTTIN, signal.SIG_IGN)
 
@@ -152,79 +205,116 @@ def sigtstp_handler(signum, frame):
 signal.signal(signal.SIGTSTP, sigtstp_handler)
 
 # ---- Builtin implementations ----
-def builtin_cd(args):
-    target = args[0] if args else os.environ.get("HOME", "/")
+# Builtins take the whole token list (tokens[0] is the command name) so
+# dispatch doesn't copy the arguments; each one slices only if it needs to.
+def builtin_cd(tokens):
+    target = tokens[1] if len(tokens) > 1 else os.environ.get("HOME", "/")
     try:
-        os.chdir(os.path.expanduser(target))
+        # expanduser only matters for ~ paths; skip its env/pwd lookup otherwise
+        os.chdir(os.path.expanduser(target) if target.startswith("~") else target)
     except Exception as e:
         print(f"cd: {e}")
 
-def builtin_pwd(args):
+def builtin_pwd(tokens):
     print(os.getcwd())
 
-def builtin_exit(args):
+def builtin_exit(tokens):
     print("Exiting shell.")
     # terminate background jobs
     for jid, job in list(jobs.items()):
-        pid = job["pid"]
+        pid = job.pid
         try:
             os.killpg(os.getpgid(pid), signal.SIGTERM)
         except Exception:
             pass
     sys.exit(0)
 
-def builtin_echo(args):
-    print(" ".join(args))
+def builtin_echo(tokens):
+    print(" ".join(tokens[1:]))
+
+_CLEAR = b"\x1b[H\x1b[J"
 
-def builtin_clear(args):
-    print("\033[H\033[J", end="")
+def builtin_clear(tokens):
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_CLEAR)
+    sys.stdout.buffer.flush()
 
-def builtin_ls(args):
-    target = args[0] if args else "."
+def builtin_ls(tokens):
+    target = tokens[1] if len(tokens) > 1 else "."
     try:
-        names = os.listdir(target)
-        names.sort()
-        for n in names:
-            print(n)
+        with os.scandir(target) as it:
+            names = sorted(e.name for e in it)
+        if names:
+            sys.stdout.write("\n".join(names) + "\n")
     except Exception as e:
         print(f"ls: {e}")
 
-def builtin_cat(args):
-    if not args:
+# sendfile errors meaning "not supported for these fds"; fall back to a buffered copy
+_SENDFILE_FALLBACK_ERRNOS = frozenset((errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP))
+
+def _copy_to_stdout(f):
+    """
+    Copy binary file f to stdout without decoding it.
+    Tries os.sendfile first, then copies whatever is left through a fixed buffer.
+    """
+    sys.stdout.flush()
+    out_fd = sys.stdout.fileno()
+    in_fd = f.fileno()
+    offset = 0
+    size = os.fstat(in_fd).st_size
+    try:
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except AttributeError:
+        # no sendfile on this platform
+        pass
+    except OSError as e:
+        if e.errno not in _SENDFILE_FALLBACK_ERRNOS:
+            raise
+    # files like /proc entries report size 0; copy anything sendfile didn't
+    f.seek(offset)
+    shutil.copyfileobj(f, sys.stdout.buffer, length=65536)
+    sys.stdout.buffer.flush()
+
+def builtin_cat(tokens):
+    if len(tokens) < 2:
         print("cat: missing filename")
         return
-    for filename in args:
+    for filename in tokens[1:]:
         try:
-            with open(filename, "r") as f:
-                sys.stdout.write(f.read())
+            with open(filename, "rb") as f:
+                _copy_to_stdout(f)
         except Exception as e:
             print(f"cat: {filename}: {e}")
 
-def builtin_mkdir(args):
-    if not args:
+def builtin_mkdir(tokens):
+    if len(tokens) < 2:
         print("mkdir: missing directory")
         return
-    for d in args:
+    for d in tokens[1:]:
         try:
             os.makedirs(d, exist_ok=False)
         except Exception as e:
             print(f"mkdir: {d}: {e}")
 
-def builtin_rmdir(args):
-    if not args:
+def builtin_rmdir(tokens):
+    if len(tokens) < 2:
         print("rmdir: missing directory")
         return
-    for d in args:
+    for d in tokens[1:]:
         try:
             os.rmdir(d)
         except Exception as e:
             print(f"rmdir: {d}: {e}")
 
-def builtin_rm(args):
-    if not args:
+def builtin_rm(tokens):
+    if len(tokens) < 2:
         print("rm: missing filename")
         return
-    for f in args:
+    for f in tokens[1:]:
         try:
             if os.path.isdir(f):
                 print(f"rm: {f}: is a directory")
@@ -233,11 +323,11 @@ def builtin_rm(args):
         except Exception as e:
             print(f"rm: {f}: {e}")
 
-def builtin_touch(args):
-    if not args:
+def builtin_touch(tokens):
+    if len(tokens) < 2:
         print("touch: missing filename")
         return
-    for fname in args:
+    for fname in tokens[1:]:
         try:
             fd = open(fname, "a")
             fd.close()
@@ -245,11 +335,11 @@ def builtin_touch(args):
         except Exception as e:
             print(f"touch: {fname}: {e}")
 
-def builtin_kill(args):
-    if not args:
+def builtin_kill(tokens):
+    if len(tokens) < 2:
         print("kill: missing pid/job")
         return
-    for token in args:
+    for token in tokens[1:]:
         try:
             # job syntax: %<jobid>
             if token.startswith("%"):
@@ -259,7 +349,7 @@ def builtin_kill(args):
                 if not job:
                     print(f"kill: % {jid}: no such job")
                     continue
-                pid = job["pid"]
+                pid = job.pid
                 try:
                     os.killpg(os.getpgid(pid), signal.SIGTERM)
                 except Exception as e:
@@ -274,23 +364,23 @@ def builtin_kill(args):
         except ValueError:
             print(f"kill: invalid pid/job: {token}")
 
-def builtin_jobs(args):
+def builtin_jobs(tokens):
     now = time.time()
+    out = []
     for jid, job in jobs.items():
-        status = job["status"]
-        age = int(now - job["start_time"])
-        exitcode = job.get("exitcode")
-        print(f"[{jid}] {job['pid']} {status}\t{job['cmdline']} (age {age}s)")
+        age = int(now - job.start_time)
+        out.append(f"[{jid}] {job.pid} {job.status}\t{job.cmdline} (age {age}s)\n")
+    sys.stdout.write("".join(out))
 
-def builtin_fg(args):
+def builtin_fg(tokens):
     """
     Bring job to foreground. Usage: fg <jobid>
     If missing jobid, try last job.
     """
     global foreground_pid
-    if args:
+    if len(tokens) > 1:
         try:
-            jid = int(args[0])
+            jid = int(tokens[1])
         except ValueError:
             print("fg: bad job id")
             return
@@ -303,53 +393,33 @@ def builtin_fg(args):
     if not job:
         print(f"fg: job {jid} not found")
         return
-    pid = job["pid"]
-    proc = job["proc"]
+    pid = job.pid
+    with _job_lock:
+        if pid_to_jid.get(pid) != jid or pid not in _live_pids:
+            # reaper already recorded its exit
+            print(f"fg: job {jid} has terminated")
+            return
+        _fg_waits[pid] = None
+        job.status = "Running"
     # send SIGCONT to the process group
     try:
         os.killpg(os.getpgid(pid), signal.SIGCONT)
     except Exception:
         pass
-    job["status"] = "Running"
     foreground_pid = pid
-    try:
-        # Wait until process exits or is stopped; let sigchld_handler update statuses too.
-        while True:
-            try:
-                wpid, status = os.waitpid(pid, os.WUNTRACED)
-            except InterruptedError:
-                continue
-            if wpid == 0:
-                continue
-            if os.WIFSTOPPED(status):
-                job["status"] = "Stopped"
-                # re-add pid->jid mapping (if it was removed earlier)
-                pid_to_jid[pid] = jid
-                print(f"\n[{jid}] {pid} Stopped")
-                break
-            elif os.WIFEXITED(status):
-                exitcode = os.WEXITSTATUS(status)
-                job["status"] = f"Exited({exitcode})"
-                job["exitcode"] = exitcode
-                # cleanup mapping
-                pid_to_jid.pop(pid, None)
-                break
-            elif os.WIFSIGNALED(status):
-                sig = os.WTERMSIG(status)
-                job["status"] = f"Signaled({sig})"
-                pid_to_jid.pop(pid, None)
-                break
-    except Exception:
-        pass
+    # Wait until process exits or is stopped; the reaper updates the job entry.
+    status = _wait_foreground(pid)
+    if os.WIFSTOPPED(status):
+        print(f"\n[{jid}] {pid} Stopped")
     foreground_pid = None
 
-def builtin_bg(args):
+def builtin_bg(tokens):
     """
     Resume a stopped job in background. Usage: bg <jobid>
     """
-    if args:
+    if len(tokens) > 1:
         try:
-            jid = int(args[0])
+            jid = int(tokens[1])
         except ValueError:
             print("bg: bad job id")
             return
@@ -362,15 +432,20 @@ def builtin_bg(args):
     if not job:
         print(f"bg: job {jid} not found")
         return
-    pid = job["pid"]
-    try:
-        os.killpg(os.getpgid(pid), signal.SIGCONT)
-        job["status"] = "Running"
-        # ensure pid->jid mapping exists
-        pid_to_jid[pid] = jid
-        print(f"[{jid}] {pid} continued in background")
-    except Exception as e:
-        print(f"bg: {e}")
+    pid = job.pid
+    # hold the lock across SIGCONT so the reaper can't record an exit in between
+    with _job_lock:
+        if pid_to_jid.get(pid) != jid or pid not in _live_pids:
+            # reaper already recorded its exit
+            print(f"bg: job {jid} has terminated")
+            return
+        try:
+            os.killpg(os.getpgid(pid), signal.SIGCONT)
+            job.status = "Running"
+        except Exception as e:
+            print(f"bg: {e}")
+            return
+    print(f"[{jid}] {pid} continued in background")
 
 # builtins dispatch table
 builtins = {
@@ -392,70 +467,148 @@ builtins = {
 }
 
 # ---- Command execution ----
+# Signals Python ignores at startup that children should get back at their
+# default disposition (what Popen's restore_signals did)
+_CHILD_DEFAULT_SIGNALS = tuple(
+    getattr(signal, name) for name in ("SIGPIPE", "SIGXFSZ") if hasattr(signal, name)
+)
+
+def _spawn(tokens):
+    """
+    Start tokens in a new process group; return the child's pid.
+    Uses os.posix_spawnp (no page-table copy) and falls back to _fork_exec
+    where it or its setpgroup option is unavailable.
+    Raises FileNotFoundError if the command doesn't exist.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    spawn = getattr(os, "posix_spawnp", None)
+    if spawn is not None:
+        try:
+            return spawn(tokens[0], tokens, os.environ,
+                         setpgroup=0, setsigdef=_CHILD_DEFAULT_SIGNALS)
+        except NotImplementedError:
+            pass
+    return _fork_exec(tokens)
+
+def _fork_exec(tokens):
+    """
+    Fork and exec tokens in a new process group; return the child's pid.
+    Exec failures come back over a close-on-exec pipe and are raised here
+    as OSError (FileNotFoundError if the command doesn't exist).
+    """
+    # os.pipe() fds are close-on-exec, so a successful exec just closes err_w
+    err_r, err_w = os.pipe()
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # child: new process group so signals target job only
+            code = 0
+            try:
+                os.setpgrp()
+                for sig in _CHILD_DEFAULT_SIGNALS:
+                    signal.signal(sig, signal.SIG_DFL)
+                os.execvp(tokens[0], tokens)
+            except OSError as e:
+                code = e.errno or 0
+            except BaseException:
+                pass
+            try:
+                os.write(err_w, str(code).encode())
+            finally:
+                os._exit(127)
+        os.close(err_w)
+        err_w = None
+        # parent sets the group too, so callers never see the child in our group
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            # child already exec'd (EACCES) or exited; it set its own group
+            pass
+        # EOF means exec succeeded; anything else is the child's errno
+        data = b""
+        while True:
+            chunk = os.read(err_r, 64)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(err_r)
+        if err_w is not None:
+            os.close(err_w)
+    if not data:
+        return pid
+    # exec failed: collect the child unless the reaper got there first
+    try:
+        os.waitpid(pid, 0)
+    except ChildProcessError:
+        pass
+    code = int(data)
+    if code:
+        raise OSError(code, os.strerror(code), tokens[0])
+    raise OSError(f"exec of {tokens[0]} failed")
+
 def launch_external(tokens, background=False):
     """
     Launch external command. If background True, do not wait; store job.
-    Use preexec_fn=os.setpgrp to create new process group so signals target job only.
+    Returns the child's pid, or None if the command couldn't be started.
     """
+    global foreground_pid
     cmdline = " ".join(tokens)
-    try:
-        proc = subprocess.Popen(tokens, preexec_fn=os.setpgrp)
-    except FileNotFoundError:
-        print(f"{tokens[0]}: command not found")
-        return None
-    except Exception as e:
-        print(f"Error launching {tokens[0]}: {e}")
-        return None
-
-    if background:
-        jid = add_job(proc, cmdline, status="Running")
-        print(f"[{jid}] {proc.pid}")
-        return proc
-    else:
-        # Foreground: wait until process exits or is stopped
-        global foreground_pid
-        foreground_pid = proc.pid
+    # hold the lock until pid is registered so the reaper can't report it first
+    with _job_lock:
         try:
-            while True:
-                try:
-                    wpid, status = os.waitpid(proc.pid, os.WUNTRACED)
-                except InterruptedError:
-                    continue
-                if wpid == 0:
-                    continue
-                if os.WIFSTOPPED(status):
-                    # stopped; create a job entry
-                    jid = add_job(proc, cmdline, status="Stopped")
-                    print(f"\n[{jid}] {proc.pid} Stopped")
-                    break
-                elif os.WIFEXITED(status):
-                    break
-                elif os.WIFSIGNALED(status):
-                    break
-        except Exception:
-            pass
+            pid = _spawn(tokens)
+        except FileNotFoundError:
+            print(f"{tokens[0]}: command not found")
+            return None
+        except Exception as e:
+            print(f"Error launching {tokens[0]}: {e}")
+            return None
+        _live_pids.add(pid)
+        _job_lock.notify_all()
+
+        if background:
+            jid = add_job(pid, cmdline, status="Running")
+            print(f"[{jid}] {pid}")
+            return pid
+        # Foreground: wait until process exits or is stopped
+        _fg_waits[pid] = None
+        foreground_pid = pid
+        status = _wait_foreground(pid)
+        if os.WIFSTOPPED(status):
+            # stopped; create a job entry
+            jid = add_job(pid, cmdline, status="Stopped")
+            print(f"\n[{jid}] {pid} Stopped")
         foreground_pid = None
-        return proc
+        return pid
 
 def prune_done_jobs():
-    """Remove Done/Exited entries older than TTL."""
+    """Remove Done/Exited entries whose TTL has expired."""
     now = time.time()
-    to_remove = []
-    for jid, job in list(jobs.items()):
-        status = job["status"]
-        if status.startswith("Exited") or status.startswith("Signaled") or status == "Done":
-            age = now - job["start_time"]
-            if age > DONE_ENTRY_TTL:
-                to_remove.append(jid)
-    for jid in to_remove:
-        jobs.pop(jid, None)
+    with _job_lock:
+        while _expiry_heap and _expiry_heap[0][0] <= now:
+            _, jid = heapq.heappop(_expiry_heap)
+            jobs.pop(jid, None)
+
+@functools.lru_cache(maxsize=128)
+def _shlex_split(line):
+    # tuple so cached results can't be mutated by callers
+    return tuple(shlex.split(line))
+
+def _tokenize(line):
+    """Split a command line; plain whitespace-separated lines skip shlex."""
+    if '"' in line or "'" in line or "\\" in line:
+        # repeated quoted commands hit the cache instead of the lexer
+        return list(_shlex_split(line))
+    return line.split()
 
 def parse_and_execute(line):
     line = line.strip()
     if not line:
         return
     try:
-        tokens = shlex.split(line)
+        tokens = _tokenize(line)
     except ValueError as e:
         print(f"Parsing error: {e}")
         return
@@ -480,7 +633,7 @@ def parse_and_execute(line):
     # built-in?
     if cmd in builtins:
         try:
-            builtins[cmd](tokens[1:])
+            builtins[cmd](tokens)
         except Exception as e:
             print(f"{cmd}: error: {e}")
         return
@@ -489,14 +642,41 @@ def parse_and_execute(line):
     launch_external(tokens, background=background)
 
 # ---- REPL ----
+# username can't change under us, so look it up once
+_USER = getpass.getuser() if hasattr(getpass, "getuser") else os.environ.get("USER", "")
+_prompt_cache = (None, None)  # (cwd, rendered prompt)
+
 def prompt():
-    user = getpass.getuser() if hasattr(getpass, "getuser") else os.environ.get("USER", "")
+    global _prompt_cache
     cwd = os.getcwd()
-    base = os.path.basename(cwd) or "/"
-    return f"{user}:{base}$ "
+    if cwd != _prompt_cache[0]:
+        base = os.path.basename(cwd) or "/"
+        _prompt_cache = (cwd, f"{_USER}:{base}$ ")
+    return _prompt_cache[1]
+
+def _setup_history():
+    """Load readline history and save it again on exit."""
+    if readline is None:
+        return
+    readline.set_auto_history(True)
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+    def save_history():
+        try:
+            readline.write_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+
+    atexit.register(save_history)
 
 def main():
     print("myshell — Deliverable 1 shell (type 'exit' to quit).")
+    _setup_history()
+    last_prune = time.monotonic()
     try:
         while True:
             try:
@@ -509,8 +689,11 @@ def main():
                 print()
                 continue
             parse_and_execute(line)
-            # prune old Done entries
-            prune_done_jobs()
+            # prune old Done entries, at most once per PRUNE_INTERVAL
+            now = time.monotonic()
+            if now - last_prune > PRUNE_INTERVAL:
+                prune_done_jobs()
+                last_prune = now
     except SystemExit:
         pass
     except Exception as e: